@@ -30,6 +30,7 @@ app.use(cookieParser());
 const adminPublicDir = path.join(ROOT_DIR, 'admin', 'public');
 const assetsDir = path.join(ROOT_DIR, 'assets');
 const contentPostsDir = path.join(ROOT_DIR, 'content', 'posts');
+const contentSearchDir = path.join(ROOT_DIR, 'content', 'search');
 const categoriesRegistryPath = path.join(ROOT_DIR, 'content', 'categories.json');
 const apiTokenStorePath = path.join(ROOT_DIR, 'content', 'api-tokens.json');
 const uploadDir = path.join(assetsDir, 'uploads');
@@ -1627,6 +1628,7 @@ app.get(`/api/${API_VERSION}/taxonomy`, async (req, res, next) => {
 
 app.use('/assets', express.static(assetsDir));
 app.use('/content/posts', express.static(contentPostsDir));
+app.use('/content/search', express.static(contentSearchDir));
 app.use('/admin', express.static(adminPublicDir));
 
 function isSafeSlug(slug) {
@@ -1753,7 +1755,7 @@ app.get('/', async (_req, res) => {
   await sendGeneratedHtml(res, path.join(ROOT_DIR, 'index.html'));
 });
 
-for (const section of ['list', 'categories', 'tags', 'about']) {
+for (const section of ['list', 'categories', 'tags', 'about', 'search']) {
   app.get([`/${section}`, `/${section}/`], async (_req, res) => {
     await sendGeneratedHtml(res, path.join(ROOT_DIR, section, 'index.html'));
   });
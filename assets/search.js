@@ -0,0 +1,149 @@
+(function () {
+  'use strict';
+
+  const form = document.querySelector('#search-form');
+  const input = document.querySelector('#search-input');
+  const results = document.querySelector('#search-results');
+  if (!form || !input || !results) return;
+
+  const INDEX_BASE = '/content/search';
+  // Must stay in sync with SEARCH_TOKEN_RE in scripts/github_trend_daily.py.
+  const TOKEN_RE = /[a-z0-9][a-z0-9+#.]*|[\u3400-\u9fff]+/g;
+  const MAX_RESULTS = 50;
+
+  let manifestPromise = null;
+  const shardPromises = new Map();
+
+  function escapeHtml(value) {
+    return String(value)
+      .replaceAll('&', '&amp;')
+      .replaceAll('<', '&lt;')
+      .replaceAll('>', '&gt;')
+      .replaceAll('"', '&quot;')
+      .replaceAll("'", '&#39;');
+  }
+
+  function tokenize(text) {
+    const tokens = [];
+    for (const match of String(text || '').toLowerCase().matchAll(TOKEN_RE)) {
+      let raw = match[0];
+      if (raw[0] >= '\u3400' && raw[0] <= '\u9fff') {
+        if (raw.length === 1) {
+          tokens.push(raw);
+        } else {
+          for (let i = 0; i < raw.length - 1; i += 1) tokens.push(raw.slice(i, i + 2));
+        }
+        continue;
+      }
+      // Single letters are kept: the index stores them for `lang` (C, R, D, V) only.
+      raw = raw.replace(/\.+$/, '');
+      if (raw) tokens.push(raw);
+    }
+    return [...new Set(tokens)];
+  }
+
+  function shardForToken(token, shardCount) {
+    // FNV-1a over code points, matching search_shard_for_token().
+    let h = 0x811c9dc5;
+    for (const ch of token) {
+      h ^= ch.codePointAt(0);
+      h = Math.imul(h, 0x01000193) >>> 0;
+    }
+    return h % shardCount;
+  }
+
+  async function fetchJson(url) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`Failed to fetch ${url}: ${response.status}`);
+    return response.json();
+  }
+
+  function loadManifest() {
+    if (!manifestPromise) {
+      manifestPromise = fetchJson(`${INDEX_BASE}/manifest.json`).catch((error) => {
+        manifestPromise = null;
+        throw error;
+      });
+    }
+    return manifestPromise;
+  }
+
+  function loadShard(shard) {
+    if (!shardPromises.has(shard)) {
+      const name = `shard-${String(shard).padStart(2, '0')}.json`;
+      // Shards that were never written simply hold no postings.
+      shardPromises.set(shard, fetchJson(`${INDEX_BASE}/${name}`).catch(() => ({})));
+    }
+    return shardPromises.get(shard);
+  }
+
+  async function search(query) {
+    const tokens = tokenize(query);
+    if (!tokens.length) return [];
+
+    const manifest = await loadManifest();
+    const shardIds = [...new Set(tokens.map((token) => shardForToken(token, manifest.shardCount)))];
+    const shards = new Map(await Promise.all(shardIds.map(async (id) => [id, await loadShard(id)])));
+
+    // Every token must match; scores add up across tokens.
+    let scores = null;
+    for (const token of tokens) {
+      const postings = shards.get(shardForToken(token, manifest.shardCount))[token] || [];
+      const next = new Map();
+      for (const [docId, score] of postings) {
+        if (scores === null || scores.has(docId)) {
+          next.set(docId, (scores?.get(docId) || 0) + score);
+        }
+      }
+      scores = next;
+      if (!scores.size) return [];
+    }
+
+    return [...scores.entries()]
+      .sort((a, b) => b[1] - a[1] || b[0] - a[0])
+      .map(([docId]) => manifest.docs[String(docId)])
+      .filter(Boolean)
+      .slice(0, MAX_RESULTS)
+      .map(([slug, repo, lang]) => ({ slug, repo, lang, date: slug.replace(/^github-trend-/, '') }));
+  }
+
+  function renderResults(query, hits) {
+    if (!query.trim()) {
+      results.innerHTML = '';
+      return;
+    }
+    if (!hits.length) {
+      results.innerHTML = '<p>没有找到相关内容。</p>';
+      return;
+    }
+    const items = hits
+      .map((hit) => `<li class="list-item"><a href="/posts/${encodeURIComponent(hit.slug)}/"><span class="post-date"><time>${escapeHtml(hit.date)}</time></span><p class="post-title">${escapeHtml(hit.repo)}${hit.lang ? `（${escapeHtml(hit.lang)}）` : ''}</p></a></li>`)
+      .join(' ');
+    results.innerHTML = `<ul class="m-list">${items}</ul>`;
+  }
+
+  async function run() {
+    const query = input.value;
+    const url = new URL(window.location.href);
+    url.searchParams.set('q', query);
+    window.history.replaceState(null, '', url);
+
+    try {
+      renderResults(query, await search(query));
+    } catch (error) {
+      results.innerHTML = '<p>搜索索引加载失败，请稍后重试。</p>';
+      console.error(error);
+    }
+  }
+
+  form.addEventListener('submit', (event) => {
+    event.preventDefault();
+    run();
+  });
+
+  const initial = new URL(window.location.href).searchParams.get('q');
+  if (initial) {
+    input.value = initial;
+    run();
+  }
+})();
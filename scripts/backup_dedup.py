@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Deduplicated incremental backups for scripts/daily_release_backup.sh (BACKUP_MODE=dedup).
+
+Files are split with content-defined chunking, so an edit only changes the chunks around it.
+Each run compresses only chunks the store has not seen before into one pack, encrypts the
+pack with `openssl enc`, and writes an encrypted per-day manifest for point-in-time restore.
+
+Store layout:
+
+    <store>/index.json                 chunk sha256 -> [pack, offset, length] (local only)
+    <store>/index-<date>.json.enc      encrypted copy of the latest index (the one to upload)
+    <store>/packs/<pack>.pack.enc      zlib-compressed chunks, concatenated, then encrypted
+    <store>/manifests/<date>.json.enc  files of that day -> size, mode, sha256, chunk list; dirs -> mode
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+# 16 mask bits: cut points roughly every 64 KiB after MIN_CHUNK.
+CHUNK_MASK = (1 << 16) - 1
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'big') for i in range(256)]
+
+# Mirrors the tar --exclude list in daily_release_backup.sh (paths relative to the root).
+EXCLUDES = {
+    '.git',
+    'node_modules',
+    '.venv',
+    '.local-libs',
+    'qa-screenshots',
+    '.server.log',
+    '.admin.log',
+    '.server.pid',
+    '.admin.pid',
+}
+
+
+def password_for(date_stamp: str) -> str:
+    # Same default as the full-backup mode: the object's own YYYYMMDD stamp.
+    return os.getenv('BACKUP_PASSWORD') or date_stamp
+
+
+def openssl(args, data: bytes, date_stamp: str) -> bytes:
+    env = {**os.environ, 'OPFLOW_BACKUP_PASS': password_for(date_stamp)}
+    result = subprocess.run(
+        ['openssl', 'enc', '-aes-256-cbc', '-salt', '-pbkdf2', '-iter', '200000', *args,
+         '-pass', 'env:OPFLOW_BACKUP_PASS'],
+        input=data,
+        capture_output=True,
+        env=env,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'openssl failed: {result.stderr.decode("utf-8", errors="ignore").strip()}')
+    return result.stdout
+
+
+def encrypt(data: bytes, date_stamp: str) -> bytes:
+    return openssl([], data, date_stamp)
+
+
+def decrypt(data: bytes, date_stamp: str) -> bytes:
+    return openssl(['-d'], data, date_stamp)
+
+
+def chunk_boundaries(data: bytes):
+    """Yield (start, end) cut points using a gear rolling hash (FastCDC-style, with min-size skip)."""
+    n = len(data)
+    start = 0
+    gear = GEAR
+    mask = CHUNK_MASK
+    while start < n:
+        if n - start <= MIN_CHUNK:
+            yield start, n
+            return
+        end = min(start + MAX_CHUNK, n)
+        h = 0
+        i = start + MIN_CHUNK
+        cut = end
+        while i < end:
+            h = ((h << 1) + gear[data[i]]) & 0xFFFFFFFF
+            if not h & mask:
+                cut = i + 1
+                break
+            i += 1
+        yield start, cut
+        start = cut
+
+
+def iter_files(root: Path, store: Path):
+    store = store.resolve()
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        rel_dir = current.relative_to(root)
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not (rel_dir == Path('.') and d in EXCLUDES) and (current / d).resolve() != store
+        )
+        for name in sorted(filenames):
+            if rel_dir == Path('.') and name in EXCLUDES:
+                continue
+            yield current / name
+        # Directories are yielded too, so empty ones survive a restore; symlinked ones are not descended.
+        for name in dirnames:
+            yield current / name
+
+
+def write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def load_index(store: Path):
+    path = store / 'index.json'
+    if path.exists():
+        return json.loads(path.read_text(encoding='utf-8'))
+    # Store rebuilt from off-site assets: only the encrypted index copy is available.
+    encrypted = sorted(store.glob('index-*.json.enc'))
+    if encrypted:
+        date_stamp = encrypted[-1].name[len('index-'): -len('.json.enc')]
+        return json.loads(decrypt(encrypted[-1].read_bytes(), date_stamp).decode('utf-8'))
+    return {}
+
+
+def load_manifest(store: Path, date_stamp: str):
+    path = store / 'manifests' / f'{date_stamp}.json.enc'
+    return json.loads(decrypt(path.read_bytes(), date_stamp).decode('utf-8'))
+
+
+def latest_manifest_date(store: Path, up_to: str):
+    dates = sorted(
+        p.name[: -len('.json.enc')]
+        for p in (store / 'manifests').glob('*.json.enc')
+        if p.name[: -len('.json.enc')] <= up_to
+    )
+    return dates[-1] if dates else None
+
+
+def next_pack_name(store: Path, date_stamp: str) -> str:
+    existing = list((store / 'packs').glob(f'{date_stamp}-*.pack.enc'))
+    return f'{date_stamp}-{len(existing) + 1:02d}'
+
+
+def run_backup(args):
+    root = Path(args.root).resolve()
+    store = Path(args.store)
+    store.mkdir(parents=True, exist_ok=True)
+    index = load_index(store)
+
+    # Unchanged files (same size + mtime) reuse the previous manifest's chunk list without rereading.
+    previous = {}
+    prev_date = latest_manifest_date(store, args.date)
+    if prev_date:
+        previous = load_manifest(store, prev_date)['files']
+
+    pack_name = next_pack_name(store, args.date)
+    pack = bytearray()
+    files = {}
+    dirs = {}
+    stats = {'files': 0, 'unchangedFiles': 0, 'newChunks': 0, 'reusedChunks': 0, 'bytesScanned': 0}
+
+    for path in iter_files(root, store):
+        rel = path.relative_to(root).as_posix()
+        st = path.lstat()
+        if path.is_symlink():
+            files[rel] = {'symlink': os.readlink(path)}
+            continue
+        if path.is_dir():
+            dirs[rel] = st.st_mode & 0o7777
+            continue
+        if not path.is_file():
+            continue
+        stats['files'] += 1
+
+        prev = previous.get(rel)
+        if (
+            prev
+            and prev.get('size') == st.st_size
+            and prev.get('mtime_ns') == st.st_mtime_ns
+            and all(c in index for c in prev['chunks'])
+        ):
+            files[rel] = prev
+            stats['unchangedFiles'] += 1
+            stats['reusedChunks'] += len(prev['chunks'])
+            continue
+
+        data = path.read_bytes()
+        stats['bytesScanned'] += len(data)
+        chunks = []
+        for start, end in chunk_boundaries(data):
+            piece = data[start:end]
+            digest = hashlib.sha256(piece).hexdigest()
+            chunks.append(digest)
+            if digest in index:
+                stats['reusedChunks'] += 1
+                continue
+            compressed = zlib.compress(piece, 6)
+            index[digest] = [pack_name, len(pack), len(compressed)]
+            pack.extend(compressed)
+            stats['newChunks'] += 1
+
+        files[rel] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'mode': st.st_mode & 0o7777,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'chunks': chunks,
+        }
+
+    pack_file = None
+    if pack:
+        pack_file = store / 'packs' / f'{pack_name}.pack.enc'
+        write_atomic(pack_file, encrypt(bytes(pack), args.date))
+
+    manifest = {'date': args.date, 'root': str(root), 'files': files, 'dirs': dirs}
+    manifest_file = store / 'manifests' / f'{args.date}.json.enc'
+    write_atomic(manifest_file, encrypt(json.dumps(manifest, separators=(',', ':')).encode('utf-8'), args.date))
+    # The index is written last so it never points into a pack that failed to land.
+    # It lists the sha256 of every plaintext chunk, so only the encrypted copy leaves the host.
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    encrypted_index = store / f'index-{args.date}.json.enc'
+    write_atomic(encrypted_index, encrypt(index_bytes, args.date))
+    for stale in store.glob('index-*.json.enc'):
+        if stale != encrypted_index:
+            stale.unlink()
+    write_atomic(store / 'index.json', index_bytes)
+
+    print(json.dumps({
+        'date': args.date,
+        'pack': str(pack_file) if pack_file else None,
+        'packBytes': pack_file.stat().st_size if pack_file else 0,
+        'manifest': str(manifest_file),
+        'index': str(encrypted_index),
+        **stats,
+    }))
+    return 0
+
+
+class PackReader:
+    """Decrypts each referenced pack at most once per restore."""
+
+    def __init__(self, store: Path, index: dict):
+        self.store = store
+        self.index = index
+        self.packs = {}
+
+    def chunk(self, digest: str) -> bytes:
+        pack_name, offset, length = self.index[digest]
+        if pack_name not in self.packs:
+            raw = (self.store / 'packs' / f'{pack_name}.pack.enc').read_bytes()
+            self.packs[pack_name] = decrypt(raw, pack_name[:8])
+        piece = zlib.decompress(self.packs[pack_name][offset:offset + length])
+        if hashlib.sha256(piece).hexdigest() != digest:
+            raise RuntimeError(f'chunk {digest} is corrupt in pack {pack_name}')
+        return piece
+
+
+def restore(store: Path, date_stamp: str, target: Path):
+    # Restoring over existing files would mix two trees and let verify pass on leftovers.
+    if target.exists() and any(target.iterdir()):
+        raise RuntimeError(f'restore target {target} is not empty')
+    manifest = load_manifest(store, date_stamp)
+    reader = PackReader(store, load_index(store))
+    target.mkdir(parents=True, exist_ok=True)
+    dirs = manifest.get('dirs', {})
+    for rel in sorted(dirs):
+        (target / rel).mkdir(parents=True, exist_ok=True)
+    for rel, entry in manifest['files'].items():
+        dest = target / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if 'symlink' in entry:
+            if dest.is_symlink() or dest.exists():
+                dest.unlink()
+            os.symlink(entry['symlink'], dest)
+            continue
+        with open(dest, 'wb') as fh:
+            for digest in entry['chunks']:
+                fh.write(reader.chunk(digest))
+        os.chmod(dest, entry['mode'])
+        os.utime(dest, ns=(entry['mtime_ns'], entry['mtime_ns']))
+    # Modes last and deepest first, so a read-only directory does not block writes below it.
+    for rel in sorted(dirs, reverse=True):
+        os.chmod(target / rel, dirs[rel])
+    return manifest
+
+
+def run_restore(args):
+    manifest = restore(Path(args.store), args.date, Path(args.target))
+    print(json.dumps({
+        'date': args.date,
+        'target': args.target,
+        'files': len(manifest['files']),
+        'dirs': len(manifest.get('dirs', {})),
+    }))
+    return 0
+
+
+def verify_day(store: Path, date_stamp: str):
+    """Cheap daily check: decrypt the day's manifest and packs only.
+
+    Every chunk written into the day's packs is decompressed and re-hashed, and every chunk
+    the manifest references must be present in the index. Older packs are not touched, so
+    the cost tracks the day's changes rather than the archive size.
+    """
+    manifest = load_manifest(store, date_stamp)
+    index = load_index(store)
+    problems = []
+
+    for rel, entry in manifest['files'].items():
+        missing = [d for d in entry.get('chunks', []) if d not in index]
+        if missing:
+            problems.append(f'{rel}: {len(missing)} chunk(s) missing from index')
+
+    reader = PackReader(store, index)
+    day_packs = {p.name[: -len('.pack.enc')] for p in (store / 'packs').glob(f'{date_stamp}-*.pack.enc')}
+    checked = 0
+    broken_packs = set()
+    for digest, (pack_name, _offset, _length) in index.items():
+        if pack_name not in day_packs or pack_name in broken_packs:
+            continue
+        try:
+            reader.chunk(digest)
+        except (RuntimeError, zlib.error) as exc:
+            if pack_name not in reader.packs:
+                # The whole pack failed to decrypt; report it once instead of per chunk.
+                broken_packs.add(pack_name)
+                problems.append(f'pack {pack_name}: {exc}')
+            else:
+                problems.append(f'{digest}: {exc}')
+        checked += 1
+    return manifest, checked, problems
+
+
+def run_verify(args):
+    store = Path(args.store)
+    if args.day_only:
+        manifest, checked, problems = verify_day(store, args.date)
+        print(json.dumps({
+            'date': args.date,
+            'mode': 'day-only',
+            'files': len(manifest['files']),
+            'chunksChecked': checked,
+            'problems': problems,
+            'ok': not problems,
+        }))
+        return 1 if problems else 0
+
+    target = Path(args.target) if args.target else Path(tempfile.mkdtemp(prefix=f'opflow-verify-{args.date}-'))
+    try:
+        manifest = restore(store, args.date, target)
+        mismatches = []
+        for rel, entry in manifest['files'].items():
+            dest = target / rel
+            if 'symlink' in entry:
+                if not dest.is_symlink() or os.readlink(dest) != entry['symlink']:
+                    mismatches.append(rel)
+                continue
+            if not dest.is_file() or hashlib.sha256(dest.read_bytes()).hexdigest() != entry['sha256']:
+                mismatches.append(rel)
+        dirs = manifest.get('dirs', {})
+        mismatches.extend(rel for rel in dirs if not (target / rel).is_dir() or (target / rel).is_symlink())
+        expected = set(manifest['files']) | set(dirs)
+        # Manifests written before dirs were recorded still imply every file's parents.
+        expected |= {parent.as_posix() for rel in list(expected) for parent in Path(rel).parents if parent != Path('.')}
+        for dirpath, dirnames, filenames in os.walk(target):
+            rel_dir = Path(dirpath).relative_to(target)
+            for name in dirnames + filenames:
+                rel = (rel_dir / name).as_posix()
+                if rel not in expected:
+                    mismatches.append(f'extra: {rel}')
+        print(json.dumps({
+            'date': args.date,
+            'target': str(target),
+            'files': len(manifest['files']),
+            'mismatches': mismatches,
+            'ok': not mismatches,
+        }))
+        return 1 if mismatches else 0
+    finally:
+        if not args.target:
+            shutil.rmtree(target, ignore_errors=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Deduplicated incremental backup store')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    backup = sub.add_parser('backup', help='chunk the working tree and store new chunks')
+    backup.add_argument('--root', required=True)
+    backup.add_argument('--store', required=True)
+    backup.add_argument('--date', required=True, help='YYYYMMDD stamp for the pack and manifest')
+
+    restore_cmd = sub.add_parser('restore', help='restore a day into a local directory')
+    restore_cmd.add_argument('--store', required=True)
+    restore_cmd.add_argument('--date', required=True)
+    restore_cmd.add_argument('--target', required=True)
+
+    verify = sub.add_parser('verify', help='restore a day and check every file hash')
+    verify.add_argument('--store', required=True)
+    verify.add_argument('--date', required=True)
+    verify.add_argument('--target', help='restore directory to keep (default: temporary, removed afterwards)')
+    verify.add_argument('--day-only', action='store_true',
+                        help="only check the day's manifest and newly written chunks (no full restore)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    handlers = {'backup': run_backup, 'restore': run_restore, 'verify': run_verify}
+    return handlers[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
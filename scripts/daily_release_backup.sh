@@ -8,6 +8,9 @@ ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 REPO="${GH_REPO:-OpFlow-dev/opflow-website}"
 TZ_NAME="${BACKUP_TZ:-Asia/Shanghai}"
 KEEP_DAYS="${BACKUP_KEEP_DAYS:-30}"
+# full: daily encrypted tarball (default). dedup: chunked incremental store, see scripts/backup_dedup.py.
+MODE="${BACKUP_MODE:-full}"
+STORE_DIR="${BACKUP_STORE_DIR:-${HOME}/opflow-website-backup-store}"
 
 DATE_STAMP="$(TZ="$TZ_NAME" date +%Y%m%d)"
 DATE_HUMAN="$(TZ="$TZ_NAME" date '+%F %T %Z')"
@@ -15,6 +18,11 @@ PASSWORD="$DATE_STAMP"
 TAG="backup-${DATE_STAMP}"
 TITLE="Daily Full Backup ${DATE_STAMP}"
 ASSET_NAME="opflow-website-full-${DATE_STAMP}.tar.gz.enc"
+if [[ "$MODE" == "dedup" ]]; then
+  # Separate tag prefix: the full-mode prune below (^backup-[0-9]{8}$) must never delete dedup packs.
+  TAG="backup-dedup-${DATE_STAMP}"
+  TITLE="Daily Incremental Backup ${DATE_STAMP}"
+fi
 
 TMP_DIR="$(mktemp -d /tmp/opflow-release-backup-${DATE_STAMP}-XXXXXX)"
 ARCHIVE_TAR_GZ="${TMP_DIR}/opflow-website-full-${DATE_STAMP}.tar.gz"
@@ -37,10 +45,64 @@ require_bin tar
 require_bin openssl
 require_bin date
 require_bin jq
+[[ "$MODE" == "dedup" ]] && require_bin python3
+
+case "$MODE" in
+  full | dedup) ;;
+  *)
+    echo "unknown BACKUP_MODE: $MODE (expected full or dedup)" >&2
+    exit 1
+    ;;
+esac
 
 # Ensure gh auth is valid.
 gh auth status >/dev/null
 
+if [[ "$MODE" == "dedup" ]]; then
+  # Only chunks not already in the store are compressed, encrypted and packed.
+  # Each pack/manifest is encrypted with its own date stamp, same as PASSWORD in full mode.
+  BACKUP_SUMMARY="$(python3 "$ROOT_DIR/scripts/backup_dedup.py" backup \
+    --root "$ROOT_DIR" --store "$STORE_DIR" --date "$DATE_STAMP")"
+  # Checks only today's manifest and new chunks; run a full `verify` manually or periodically.
+  python3 "$ROOT_DIR/scripts/backup_dedup.py" verify --day-only \
+    --store "$STORE_DIR" --date "$DATE_STAMP" >/dev/null
+
+  UPLOADS=(
+    "$(jq -r '.manifest' <<<"$BACKUP_SUMMARY")"
+    "$(jq -r '.index' <<<"$BACKUP_SUMMARY")"
+  )
+  PACK_FILE="$(jq -r '.pack // empty' <<<"$BACKUP_SUMMARY")"
+  [[ -n "$PACK_FILE" ]] && UPLOADS+=("$PACK_FILE")
+
+  if gh release view "$TAG" --repo "$REPO" >/dev/null 2>&1; then
+    gh release upload "$TAG" "${UPLOADS[@]}" --clobber --repo "$REPO"
+    gh release edit "$TAG" --repo "$REPO" --title "$TITLE" --notes ""
+    RELEASE_ACTION="updated"
+  else
+    gh release create "$TAG" "${UPLOADS[@]}" \
+      --repo "$REPO" \
+      --title "$TITLE" \
+      --notes ""
+    RELEASE_ACTION="created"
+  fi
+
+  # Older packs stay referenced by later manifests, so backup-dedup-* releases are never pruned.
+  jq -n \
+    --arg repo "$REPO" \
+    --arg tag "$TAG" \
+    --arg releaseAction "$RELEASE_ACTION" \
+    --arg store "$STORE_DIR" \
+    --argjson backup "$BACKUP_SUMMARY" \
+    '{
+      repo: $repo,
+      tag: $tag,
+      releaseAction: $releaseAction,
+      store: $store,
+      backup: $backup
+    }'
+  exit 0
+fi
+
 # Build compressed package (website + data) from working tree.
 # Includes local content data (content/posts, categories, token store, uploads) and site code.
 # Excludes VCS metadata, dependency caches, and transient runtime logs.
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
 import json
 import os
 import re
 import shutil
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
+from functools import partial
 from pathlib import Path
+from urllib.error import URLError
 from urllib.request import Request, urlopen
 
 from bs4 import BeautifulSoup
@@ -19,6 +25,15 @@ TRENDING_URL = 'https://github.com/trending?since=daily'
 MAX_CLONE_SECONDS = int(os.getenv('TREND_CLONE_TIMEOUT_SEC', '180'))
 MAX_CODEX_SECONDS = int(os.getenv('TREND_CODEX_TIMEOUT_SEC', '600'))
 
+# GitHub metadata enrichment. The endpoint is overridable so a local mock server can stand in.
+GITHUB_GRAPHQL_URL = os.getenv('TREND_GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+GITHUB_REST_URL = os.getenv('TREND_GITHUB_REST_URL', 'https://api.github.com').rstrip('/')
+GITHUB_TOKEN = os.getenv('TREND_GITHUB_TOKEN') or os.getenv('GITHUB_TOKEN') or ''
+METADATA_CACHE_DIR = Path(os.getenv('TREND_METADATA_CACHE_DIR', str(ROOT / '.cache' / 'github-metadata')))
+METADATA_CACHE_TTL_SECONDS = int(os.getenv('TREND_METADATA_CACHE_TTL_SEC', '3600'))
+# Repos larger than this (GitHub diskUsage, KB) are not cloned; 0 disables the budget.
+MAX_CLONE_SIZE_KB = int(os.getenv('TREND_MAX_CLONE_SIZE_KB', '0'))
+
 
 def fetch_html(url: str) -> str:
     req = Request(url, headers={'User-Agent': 'Mozilla/5.0'})
@@ -30,6 +45,20 @@ def clean(text: str) -> str:
     return re.sub(r'\s+', ' ', (text or '').strip())
 
 
+def parse_count(text: str):
+    # GitHub display counts such as '12.3k', '1,234' or '56 stars today'.
+    m = re.search(r'(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?', text or '')
+    if not m:
+        return None
+    value = float(m.group(1).replace(',', ''))
+    suffix = (m.group(2) or '').lower()
+    if suffix == 'k':
+        value *= 1_000
+    elif suffix == 'm':
+        value *= 1_000_000
+    return int(round(value))
+
+
 def parse_top10(html: str):
     soup = BeautifulSoup(html, 'html.parser')
     rows = soup.select('article.Box-row')[:10]
@@ -78,10 +107,142 @@ def parse_top10(html: str):
             'stars': stars,
             'forks': forks,
             'today': today,
+            'stars_count': parse_count(stars),
+            'forks_count': parse_count(forks),
+            'today_count': parse_count(today),
         })
     return items
 
 
+GITHUB_METADATA_FIELDS = '''
+    stargazerCount
+    forkCount
+    diskUsage
+    pushedAt
+    defaultBranchRef { name }
+    licenseInfo { spdxId }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+'''
+
+
+def build_metadata_query(repos):
+    parts = []
+    for i, repo in enumerate(repos):
+        owner, _, name = repo.partition('/')
+        parts.append(f'  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{{GITHUB_METADATA_FIELDS}  }}')
+    return 'query {\n' + '\n'.join(parts) + '\n}'
+
+
+def normalize_graphql_repo(node: dict):
+    topics = ((node.get('repositoryTopics') or {}).get('nodes')) or []
+    return {
+        'stars_count': node.get('stargazerCount'),
+        'forks_count': node.get('forkCount'),
+        'size_kb': node.get('diskUsage'),
+        'pushed_at': node.get('pushedAt'),
+        'default_branch': (node.get('defaultBranchRef') or {}).get('name'),
+        'license': (node.get('licenseInfo') or {}).get('spdxId'),
+        'topics': [t['topic']['name'] for t in topics if (t or {}).get('topic')],
+    }
+
+
+def normalize_rest_repo(node: dict):
+    return {
+        'stars_count': node.get('stargazers_count'),
+        'forks_count': node.get('forks_count'),
+        'size_kb': node.get('size'),
+        'pushed_at': node.get('pushed_at'),
+        'default_branch': node.get('default_branch'),
+        'license': (node.get('license') or {}).get('spdx_id'),
+        'topics': node.get('topics') or [],
+    }
+
+
+def post_json(url: str, payload: dict, headers: dict):
+    body = json.dumps(payload).encode('utf-8')
+    req = Request(url, data=body, headers={**headers, 'Content-Type': 'application/json'}, method='POST')
+    with urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode('utf-8'))
+
+
+def get_json(url: str, headers: dict):
+    req = Request(url, headers=headers)
+    with urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode('utf-8'))
+
+
+def fetch_metadata_batch(repos):
+    # One request for all repos: GraphQL with a token, REST search otherwise.
+    headers = {'User-Agent': 'Mozilla/5.0', 'Accept': 'application/vnd.github+json'}
+    if GITHUB_TOKEN:
+        headers['Authorization'] = f'Bearer {GITHUB_TOKEN}'
+        data = post_json(GITHUB_GRAPHQL_URL, {'query': build_metadata_query(repos)}, headers)
+        nodes = (data.get('data') or {})
+        result = {}
+        for i, repo in enumerate(repos):
+            node = nodes.get(f'r{i}')
+            if node:
+                result[repo] = normalize_graphql_repo(node)
+        # Partial errors (e.g. one renamed repo) still return the other nodes; a reply with
+        # errors and no nodes (rate limit, bad query) must not be cached as an empty success.
+        if data.get('errors') and not result:
+            messages = '; '.join(str((err or {}).get('message', err)) for err in data['errors'])
+            raise ValueError(f'GraphQL errors: {messages}')
+        return result
+
+    # Unauthenticated fallback: a single search query ORs every repo qualifier.
+    query = '+'.join(f'repo:{repo}' for repo in repos)
+    data = get_json(f'{GITHUB_REST_URL}/search/repositories?q={query}&per_page=100', headers)
+    by_name = {(node.get('full_name') or '').lower(): node for node in data.get('items') or []}
+    return {repo: normalize_rest_repo(by_name[repo.lower()]) for repo in repos if repo.lower() in by_name}
+
+
+def metadata_cache_path(repos):
+    # Endpoint and auth mode are part of the key so pointing at a mock server bypasses real responses.
+    endpoint = f'graphql:{GITHUB_GRAPHQL_URL}' if GITHUB_TOKEN else f'rest:{GITHUB_REST_URL}'
+    key = hashlib.sha256('\n'.join([endpoint, *sorted(repos)]).encode('utf-8')).hexdigest()[:16]
+    return METADATA_CACHE_DIR / f'{key}.json'
+
+
+def load_cached_metadata(repos):
+    path = metadata_cache_path(repos)
+    if not path.exists():
+        return None
+    if time.time() - path.stat().st_mtime > METADATA_CACHE_TTL_SECONDS:
+        return None
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except Exception:
+        return None
+
+
+def enrich_with_github_metadata(items):
+    repos = [it['repo'] for it in items if '/' in it.get('repo', '')]
+    if not repos:
+        return items
+
+    metadata = load_cached_metadata(repos)
+    if metadata is None:
+        try:
+            metadata = fetch_metadata_batch(repos)
+        except (URLError, OSError, ValueError) as exc:
+            print(f'GitHub 元数据获取失败，沿用 Trending 解析值：{exc}')
+            return items
+        path = metadata_cache_path(repos)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(metadata, ensure_ascii=False), encoding='utf-8')
+
+    for it in items:
+        meta = metadata.get(it['repo'])
+        if not meta:
+            continue
+        for key, value in meta.items():
+            if value is not None:
+                it[key] = value
+        it['metadata_source'] = 'api'
+    return items
+
+
 def ensure_category(name: str):
     CATEGORIES_FILE.parent.mkdir(parents=True, exist_ok=True)
     if CATEGORIES_FILE.exists():
@@ -300,9 +461,13 @@ PLACEHOLDER_PATTERNS = [
 ]
 
 
+# One alternation instead of a re.search per pattern; literal spaces match any whitespace run,
+# so callers no longer need to clean() the text first.
+PLACEHOLDER_RE = re.compile('|'.join(p.replace(' ', r'\s+') for p in PLACEHOLDER_PATTERNS), re.IGNORECASE)
+
+
 def has_placeholder(text: str) -> bool:
-    t = clean(text)
-    return any(re.search(p, t, re.IGNORECASE) for p in PLACEHOLDER_PATTERNS)
+    return PLACEHOLDER_RE.search(text or '') is not None
 
 
 def normalize_analysis(obj: dict, fallback_desc: str, fallback_lang: str):
@@ -333,9 +498,9 @@ def normalize_analysis(obj: dict, fallback_desc: str, fallback_lang: str):
         collaborations = []
 
     feature = clean(str(feature))
-    stack = [clean(str(x)) for x in stack if clean(str(x))]
-    core = [clean(str(x)) for x in core if clean(str(x))]
-    arch_components = [clean(str(x)) for x in arch_components if clean(str(x))]
+    stack = [v for v in (clean(str(x)) for x in stack) if v]
+    core = [v for v in (clean(str(x)) for x in core) if v]
+    arch_components = [v for v in (clean(str(x)) for x in arch_components) if v]
 
     normalized_collaborations = []
     for item in collaborations:
@@ -368,30 +533,101 @@ def normalize_analysis(obj: dict, fallback_desc: str, fallback_lang: str):
     }
 
 
-def is_weak_analysis(analysis: dict) -> bool:
-    feature = analysis.get('feature', '')
-    stack = analysis.get('stack', [])
-    core = analysis.get('core', [])
-    arch_components = analysis.get('arch_components', [])
-    collaborations = analysis.get('collaborations', [])
+# Maps ANALYSIS_JSON_SCHEMA keys to the keys produced by normalize_analysis().
+SCHEMA_FIELD_KEYS = {
+    '功能描述': 'feature',
+    '技术栈': 'stack',
+    '核心功能': 'core',
+    '架构组件': 'arch_components',
+    '组件协作': 'collaborations',
+}
 
-    if not feature or len(feature) < 40:
-        return True
-    if has_placeholder(feature):
-        return True
-    if any(has_placeholder(x) for x in stack):
-        return True
-    if any(has_placeholder(x) for x in core):
-        return True
-    if any(has_placeholder(x) for x in arch_components):
-        return True
-    if len(core) < 3:
-        return True
-    if len(arch_components) < 2:
-        return True
-    if len(collaborations) < 1:
-        return True
-    return False
+
+# Schema constraints are compiled once; validate() returns the reasons an analysis is weak (empty means OK).
+# Default rules match the daily job's thresholds; strict=True also enforces the schema's length/count/pattern limits.
+class AnalysisValidator:
+    def __init__(self, schema: dict):
+        self.rules = {}
+        for schema_key, key in SCHEMA_FIELD_KEYS.items():
+            spec = schema['properties'][schema_key]
+            item_spec = spec.get('items') or {}
+            self.rules[key] = {
+                'min_length': spec.get('minLength'),
+                'pattern': re.compile(spec['pattern']) if 'pattern' in spec else None,
+                'min_items': spec.get('minItems'),
+                'max_items': spec.get('maxItems'),
+                'item_min_length': item_spec.get('minLength'),
+                'item_pattern': re.compile(item_spec['pattern']) if 'pattern' in item_spec else None,
+                'item_props': {
+                    name: prop.get('minLength')
+                    for name, prop in (item_spec.get('properties') or {}).items()
+                },
+            }
+
+    def _check_items(self, key: str, values, strict: bool, placeholders: bool, reasons):
+        rule = self.rules[key]
+        if strict:
+            if rule['min_items'] is not None and len(values) < rule['min_items']:
+                reasons.append(f'{key}: 至少 {rule["min_items"]} 项，实际 {len(values)} 项')
+            if rule['max_items'] is not None and len(values) > rule['max_items']:
+                reasons.append(f'{key}: 至多 {rule["max_items"]} 项，实际 {len(values)} 项')
+
+        for i, value in enumerate(values):
+            if isinstance(value, dict):
+                if strict:
+                    for name, min_length in rule['item_props'].items():
+                        if len(str(value.get(name) or '')) < (min_length or 1):
+                            reasons.append(f'{key}[{i}].{name}: 长度不足 {min_length}')
+                continue
+            text = value if isinstance(value, str) else str(value)
+            if placeholders and has_placeholder(text):
+                reasons.append(f'{key}[{i}]: 包含占位词')
+            if strict:
+                if rule['item_min_length'] and len(text) < rule['item_min_length']:
+                    reasons.append(f'{key}[{i}]: 长度不足 {rule["item_min_length"]}')
+                if rule['item_pattern'] and not rule['item_pattern'].search(text):
+                    reasons.append(f'{key}[{i}]: 不符合模式 {rule["item_pattern"].pattern}')
+
+    def validate(self, analysis: dict, strict: bool = False):
+        reasons = []
+
+        feature = analysis.get('feature', '')
+        feature_rule = self.rules['feature']
+        if not feature or len(feature) < 40:
+            reasons.append(f'feature: 长度不足 40（实际 {len(feature or "")}）')
+        elif strict and feature_rule['min_length'] and len(feature) < feature_rule['min_length']:
+            reasons.append(f'feature: 长度不足 {feature_rule["min_length"]}（实际 {len(feature)}）')
+        if feature and has_placeholder(feature):
+            reasons.append('feature: 包含占位词')
+        if strict and feature and feature_rule['pattern'] and not feature_rule['pattern'].search(feature):
+            reasons.append(f'feature: 不符合模式 {feature_rule["pattern"].pattern}')
+
+        stack = analysis.get('stack', [])
+        core = analysis.get('core', [])
+        arch_components = analysis.get('arch_components', [])
+        collaborations = analysis.get('collaborations', [])
+
+        self._check_items('stack', stack, strict, True, reasons)
+        self._check_items('core', core, strict, True, reasons)
+        self._check_items('arch_components', arch_components, strict, True, reasons)
+        self._check_items('collaborations', collaborations, strict, False, reasons)
+
+        # Schema item counts are at least as strict, so these only apply in the default mode.
+        if not strict:
+            if len(core) < 3:
+                reasons.append(f'core: 至少 3 项，实际 {len(core)} 项')
+            if len(arch_components) < 2:
+                reasons.append(f'arch_components: 至少 2 项，实际 {len(arch_components)} 项')
+            if len(collaborations) < 1:
+                reasons.append('collaborations: 至少 1 条')
+        return reasons
+
+
+ANALYSIS_VALIDATOR = AnalysisValidator(ANALYSIS_JSON_SCHEMA)
+
+
+def is_weak_analysis(analysis: dict) -> bool:
+    return bool(ANALYSIS_VALIDATOR.validate(analysis))
 
 
 def analyze_repo_with_codex(repo_dir: Path, repo_name: str, fallback_desc: str, fallback_lang: str):
@@ -470,6 +706,17 @@ def analyze_repo_with_codex(repo_dir: Path, repo_name: str, fallback_desc: str,
     }
 
 
+def degraded_analysis(item: dict, core: str, note: str):
+    return {
+        'feature': item['desc'] or '该项目位列今日 Trending，建议关注其 README 与示例。',
+        'stack': [item['lang'] or '未知'],
+        'core': [core],
+        'arch_components': [],
+        'collaborations': [],
+        'note': note,
+    }
+
+
 def clone_and_analyze(items):
     analyzed = []
     with tempfile.TemporaryDirectory(prefix='ghtrend-', dir='/tmp') as temp_dir:
@@ -479,20 +726,21 @@ def clone_and_analyze(items):
             repo_name = item['repo']
             repo_dir = temp_root / repo_name.replace('/', '__')
 
+            size_kb = item.get('size_kb')
+            if MAX_CLONE_SIZE_KB and size_kb and size_kb > MAX_CLONE_SIZE_KB:
+                item['analysis'] = degraded_analysis(
+                    item, '仓库体积超出克隆预算，暂以 Trending 信息补充。', f'仓库体积 {size_kb}KB 超出克隆预算，已降级'
+                )
+                analyzed.append(item)
+                continue
+
             clone_cmd = [
                 'git', 'clone', '--depth', '1', '--filter=blob:none', '--single-branch', item['url'], str(repo_dir)
             ]
             clone = run_cmd(clone_cmd, timeout=MAX_CLONE_SECONDS)
 
             if clone.returncode != 0 or not repo_dir.exists():
-                item['analysis'] = {
-                    'feature': item['desc'] or '该项目位列今日 Trending，建议关注其 README 与示例。',
-                    'stack': [item['lang'] or '未知'],
-                    'core': ['仓库克隆失败，暂以 Trending 信息补充。'],
-                    'arch_components': [],
-                    'collaborations': [],
-                    'note': 'clone失败，已降级',
-                }
+                item['analysis'] = degraded_analysis(item, '仓库克隆失败，暂以 Trending 信息补充。', 'clone失败，已降级')
                 analyzed.append(item)
                 continue
 
@@ -634,6 +882,14 @@ def build_architecture_mermaid(repo: str, components, collaborations):
     return '\n'.join(lines)
 
 
+def format_stat(item: dict, key: str):
+    count = item.get(f'{key}_count')
+    if isinstance(count, int) and item.get('metadata_source') == 'api':
+        # Exact figures are only trusted once the item has been enriched from the API.
+        return f'{count:,}'
+    return item.get(key) or '未知'
+
+
 def render_markdown(date_str: str, items):
     slug = f'github-trend-{date_str}'
     top_n = len(items)
@@ -674,8 +930,8 @@ summary: {summary}
             f'### {i}. [{it["repo"]}]({it["url"]})',
             '',
             f'- 语言（Trending）：{it["lang"]}',
-            f'- 总 Star：{it["stars"]}',
-            f'- Fork：{it["forks"]}',
+            f'- 总 Star：{format_stat(it, "stars")}',
+            f'- Fork：{format_stat(it, "forks")}',
             f'- 今日新增：{it["today"]}',
             '',
             '#### 功能描述',
@@ -733,7 +989,441 @@ summary: {summary}
     return slug, header + '\n'.join(lines)
 
 
-def main():
+SIDECAR_VERSION = 1
+TREND_SLUG_RE = re.compile(r'^github-trend-(\d{4}-\d{2}-\d{2})$')
+
+
+def sidecar_path_for_slug(slug: str) -> Path:
+    return POSTS_DIR / f'{slug}.trend.json'
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def write_trend_sidecar(date_str: str, slug: str, items, rendered_hash: str):
+    # rendered_hash is the hash of the .md as written by this script; rerender uses it to spot admin edits.
+    payload = {'version': SIDECAR_VERSION, 'date': date_str, 'rendered_hash': rendered_hash, 'items': items}
+    sidecar_path_for_slug(slug).write_text(
+        json.dumps(payload, ensure_ascii=False, separators=(',', ':')) + '\n',
+        encoding='utf-8',
+    )
+
+
+FRONTMATTER_RE = re.compile(r'\A---\r?\n([\s\S]*?)\r?\n---\r?\n?')
+FRONTMATTER_STATUS_RE = re.compile(r'^status:\s*["\']?([A-Za-z]+)["\']?\s*$', re.MULTILINE)
+
+
+def post_status(text: str) -> str:
+    # Missing status means published, matching normalizeStatus() in scripts/site-lib.mjs.
+    fm = FRONTMATTER_RE.match(text)
+    m = FRONTMATTER_STATUS_RE.search(fm.group(1)) if fm else None
+    return m.group(1).lower() if m else 'published'
+
+
+def rerender_from_sidecar(sidecar_file: str, force: bool = False):
+    # Deleted/unpublished posts are skipped; posts edited since the last render are left alone unless forced.
+    data = json.loads(Path(sidecar_file).read_text(encoding='utf-8'))
+    slug, content = render_markdown(data['date'], data['items'])
+    post_file = POSTS_DIR / f'{slug}.md'
+    if not post_file.exists():
+        return slug, 'skipped'
+    old_content = post_file.read_text(encoding='utf-8')
+    if post_status(old_content) != 'published':
+        return slug, 'skipped'
+    old_hash = content_hash(old_content)
+    new_hash = content_hash(content)
+    if old_hash != data.get('rendered_hash') and not force:
+        return slug, 'edited'
+    if old_hash == new_hash:
+        outcome = 'unchanged'
+    else:
+        post_file.write_text(content, encoding='utf-8')
+        outcome = 'changed'
+    if data.get('rendered_hash') != new_hash:
+        write_trend_sidecar(data['date'], slug, data['items'], new_hash)
+    return slug, outcome
+
+
+def list_trend_sidecars(date_from: str = None, date_to: str = None):
+    sidecars = []
+    for path in sorted(POSTS_DIR.glob('github-trend-*.trend.json')):
+        m = TREND_SLUG_RE.match(path.name[: -len('.trend.json')])
+        if not m:
+            continue
+        date_str = m.group(1)
+        if date_from and date_str < date_from:
+            continue
+        if date_to and date_str > date_to:
+            continue
+        sidecars.append(path)
+    return sidecars
+
+
+SEARCH_INDEX_DIR = ROOT / 'content' / 'search'
+# Writer-only bookkeeping (doc table, per-post doc ids and shards). Browsers only fetch
+# content/search/manifest.json, which build:site derives from this file for published posts.
+SEARCH_STATE_FILE = ROOT / 'content' / 'search-state.json'
+SEARCH_INDEX_VERSION = 1
+SEARCH_SHARD_COUNT = 32
+# Must stay in sync with assets/search.js.
+SEARCH_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*|[\u3400-\u9fff]+')
+SEARCH_FIELD_WEIGHTS = {
+    'repo': 8,
+    'lang': 4,
+    'topics': 3,
+    'stack': 3,
+    'core': 1,
+}
+
+
+def tokenize_search_text(text: str, min_latin: int = 2):
+    # Latin words as-is, CJK runs as overlapping bigrams (single CJK chars stay unigrams).
+    # Single-letter Latin words are noise in prose but not in `lang` (C, R, D, V), hence min_latin.
+    tokens = []
+    for raw in SEARCH_TOKEN_RE.findall((text or '').lower()):
+        if '\u3400' <= raw[0] <= '\u9fff':
+            if len(raw) == 1:
+                tokens.append(raw)
+            else:
+                tokens.extend(raw[i:i + 2] for i in range(len(raw) - 1))
+            continue
+        raw = raw.rstrip('.')
+        if len(raw) >= min_latin:
+            tokens.append(raw)
+    return tokens
+
+
+def search_shard_for_token(token: str) -> int:
+    # FNV-1a over code points; assets/search.js computes the same value.
+    h = 0x811C9DC5
+    for ch in token:
+        h ^= ord(ch)
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h % SEARCH_SHARD_COUNT
+
+
+def search_shard_path(shard: int) -> Path:
+    return SEARCH_INDEX_DIR / f'shard-{shard:02d}.json'
+
+
+def write_json_atomic(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    tmp.replace(path)
+
+
+def load_search_state():
+    if SEARCH_STATE_FILE.exists():
+        state = json.loads(SEARCH_STATE_FILE.read_text(encoding='utf-8'))
+        if state.get('version') == SEARCH_INDEX_VERSION and state.get('shardCount') == SEARCH_SHARD_COUNT:
+            return state
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'shardCount': SEARCH_SHARD_COUNT,
+        'nextId': 0,
+        'docs': {},
+        'posts': {},
+    }
+
+
+def item_search_postings(item: dict):
+    analysis = item.get('analysis') or {}
+    fields = {
+        'repo': [item.get('repo', '')],
+        'lang': [item.get('lang', '')],
+        'topics': item.get('topics') or [],
+        'stack': analysis.get('stack') or [],
+        'core': analysis.get('core') or [],
+    }
+    scores = {}
+    for field, values in fields.items():
+        weight = SEARCH_FIELD_WEIGHTS[field]
+        min_latin = 1 if field == 'lang' else 2
+        for value in values:
+            for token in tokenize_search_text(str(value), min_latin):
+                scores[token] = scores.get(token, 0) + weight
+    return scores
+
+
+# Loads shards lazily and tracks which ones changed, so saving rewrites only those.
+class SearchIndexWriter:
+
+    def __init__(self, state=None):
+        self.state = state if state is not None else load_search_state()
+        self.shards = {}
+        self.touched = set()
+
+    def shard(self, shard: int):
+        if shard not in self.shards:
+            path = search_shard_path(shard)
+            self.shards[shard] = json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
+        return self.shards[shard]
+
+    def remove_post(self, slug: str) -> bool:
+        previous = self.state['posts'].pop(slug, None)
+        if not previous:
+            return False
+        stale_ids = set(previous['docs'])
+        for shard in previous['shards']:
+            postings = self.shard(shard)
+            for token in list(postings):
+                kept = [p for p in postings[token] if p[0] not in stale_ids]
+                if kept:
+                    postings[token] = kept
+                else:
+                    del postings[token]
+            self.touched.add(shard)
+        for doc_id in stale_ids:
+            self.state['docs'].pop(str(doc_id), None)
+        return True
+
+    def add_post(self, slug: str, items):
+        self.remove_post(slug)
+        doc_ids = []
+        post_shards = set()
+        for item in items:
+            doc_id = self.state['nextId']
+            self.state['nextId'] += 1
+            self.state['docs'][str(doc_id)] = [slug, item.get('repo', ''), item.get('lang', '')]
+            doc_ids.append(doc_id)
+            for token, score in item_search_postings(item).items():
+                shard = search_shard_for_token(token)
+                self.shard(shard).setdefault(token, []).append([doc_id, score])
+                post_shards.add(shard)
+        self.state['posts'][slug] = {'docs': doc_ids, 'shards': sorted(post_shards)}
+        self.touched |= post_shards
+
+    def prune_deleted_posts(self):
+        # Posts whose markdown was deleted (e.g. through admin).
+        removed = [slug for slug in list(self.state['posts']) if not (POSTS_DIR / f'{slug}.md').exists()]
+        for slug in removed:
+            self.remove_post(slug)
+        return removed
+
+    def save(self):
+        for shard in sorted(self.touched):
+            write_json_atomic(search_shard_path(shard), self.shards[shard])
+        write_json_atomic(SEARCH_STATE_FILE, self.state)
+
+
+def append_post_to_search_index(slug: str, items):
+    writer = SearchIndexWriter()
+    writer.prune_deleted_posts()
+    writer.add_post(slug, items)
+    writer.save()
+
+
+def run_search_index(args):
+    if args.rebuild:
+        # Recovery path; daily runs append incrementally.
+        if SEARCH_INDEX_DIR.exists():
+            shutil.rmtree(SEARCH_INDEX_DIR)
+        writer = SearchIndexWriter(state={**load_search_state(), 'nextId': 0, 'docs': {}, 'posts': {}})
+        for path in list_trend_sidecars():
+            data = json.loads(path.read_text(encoding='utf-8'))
+            writer.add_post(path.name[: -len('.trend.json')], data['items'])
+    else:
+        writer = SearchIndexWriter()
+    for slug in args.remove or []:
+        writer.remove_post(slug)
+    pruned = writer.prune_deleted_posts()
+    writer.save()
+
+    # build:site regenerates the client manifest from the state file.
+    if not args.no_build:
+        build_site()
+
+    print(json.dumps({
+        'posts': len(writer.state['posts']),
+        'docs': len(writer.state['docs']),
+        'shardsWritten': len(writer.touched),
+        'pruned': pruned,
+    }, ensure_ascii=False))
+
+
+def lint_items(slug: str, items, strict: bool = False):
+    problems = []
+    for item in items:
+        analysis = item.get('analysis') or {}
+        reasons = ANALYSIS_VALIDATOR.validate(analysis, strict=strict)
+        if item.get('arch_unrendered'):
+            # Architecture was left out of the post by design, so the markdown says nothing about it.
+            reasons = [r for r in reasons if not r.startswith(('arch_components', 'collaborations'))]
+        if reasons:
+            problems.append({
+                'repo': item.get('repo', ''),
+                'degraded': bool(analysis.get('note')),
+                'reasons': reasons,
+            })
+    return slug, len(items), problems
+
+
+def lint_sidecar(sidecar_file: str, strict: bool = False):
+    data = json.loads(Path(sidecar_file).read_text(encoding='utf-8'))
+    return lint_items(Path(sidecar_file).name[: -len('.trend.json')], data.get('items') or [], strict)
+
+
+MD_ITEM_RE = re.compile(r'^### \d+\. \[([^\]]+)\]\([^)]*\)\s*$', re.MULTILINE)
+MD_SECTION_RE = re.compile(r'^#### (.+?)\s*$', re.MULTILINE)
+MD_LANG_RE = re.compile(r'^- 语言（Trending）：(.*)$', re.MULTILINE)
+MERMAID_NODE_RE = re.compile(r'^\s*(C\d+)\["(.*)"\]\s*$', re.MULTILINE)
+MERMAID_EDGE_RE = re.compile(r'^\s*(C\d+) -->\|(.*)\| (C\d+)\s*$', re.MULTILINE)
+# Core lines written by the degraded fallbacks (clone failure, clone budget, weak codex output).
+DEGRADED_CORE_RE = re.compile(r'暂以 Trending 信息补充|自动分析结果不足')
+
+
+def md_bullets(section: str):
+    return [line[2:].strip() for line in section.splitlines() if line.startswith('- ')]
+
+
+def parse_trend_markdown(text: str):
+    # Inverse of render_markdown() for posts written before sidecars existed.
+    body = text.split('\n## 观察', 1)[0]
+    heads = list(MD_ITEM_RE.finditer(body))
+    items = []
+    for i, head in enumerate(heads):
+        block = body[head.end(): heads[i + 1].start() if i + 1 < len(heads) else len(body)]
+        lang_m = MD_LANG_RE.search(block)
+        sections = {}
+        marks = list(MD_SECTION_RE.finditer(block))
+        for j, mark in enumerate(marks):
+            sections[mark.group(1)] = block[mark.end(): marks[j + 1].start() if j + 1 < len(marks) else len(block)].strip()
+
+        stack_lines = md_bullets(sections.get('技术栈报告', ''))
+        analysis = {
+            'feature': sections.get('功能描述', ''),
+            'stack': [x.strip() for x in stack_lines[0].split('；') if x.strip()] if stack_lines else [],
+            'core': md_bullets(sections.get('核心功能', '')),
+        }
+        diagram = sections.get('架构图', '')
+        nodes = {node: name for node, name in MERMAID_NODE_RE.findall(diagram)}
+        analysis['arch_components'] = list(nodes.values())
+        analysis['collaborations'] = [
+            {'from': nodes.get(src, src), 'to': nodes.get(dst, dst), 'relation': rel}
+            for src, rel, dst in MERMAID_EDGE_RE.findall(diagram)
+        ]
+        if len(analysis['core']) == 1 and DEGRADED_CORE_RE.search(analysis['core'][0]):
+            analysis['note'] = '降级分析（由 Markdown 解析）'
+
+        lang = lang_m.group(1).strip() if lang_m else ''
+        items.append({
+            'repo': head.group(1),
+            'lang': lang,
+            'analysis': analysis,
+            'arch_unrendered': not diagram and not should_include_architecture(head.group(1), lang, '', analysis['feature']),
+        })
+    return items
+
+
+def lint_markdown_post(post_file: str, strict: bool = False):
+    text = Path(post_file).read_text(encoding='utf-8')
+    return lint_items(Path(post_file).stem, parse_trend_markdown(text), strict)
+
+
+def list_trend_posts_without_sidecar(date_from: str = None, date_to: str = None):
+    missing = []
+    for path in sorted(POSTS_DIR.glob('github-trend-*.md')):
+        m = TREND_SLUG_RE.match(path.stem)
+        if not m:
+            continue
+        date_str = m.group(1)
+        if (date_from and date_str < date_from) or (date_to and date_str > date_to):
+            continue
+        if not sidecar_path_for_slug(path.stem).exists():
+            missing.append(path)
+    return missing
+
+
+def run_lint(args):
+    sidecars = list_trend_sidecars(args.date_from, args.date_to)
+    without_sidecar = list_trend_posts_without_sidecar(args.date_from, args.date_to)
+    checked = 0
+    failures = {}
+    unparsed = []
+    jobs = [(lint_sidecar, sidecars), (lint_markdown_post, without_sidecar)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for fn, paths in jobs:
+            worker = partial(fn, strict=args.strict)
+            for slug, count, problems in pool.map(worker, [str(p) for p in paths], chunksize=16):
+                checked += count
+                if not count:
+                    unparsed.append(slug)
+                if problems:
+                    failures[slug] = problems
+
+    weak = [p for problems in failures.values() for p in problems]
+    blocking = [p for p in weak if args.include_degraded or not p['degraded']]
+    print(json.dumps({
+        'posts': len(sidecars) + len(without_sidecar),
+        'postsFromMarkdown': len(without_sidecar),
+        'analyses': checked,
+        'weak': len(weak),
+        'degraded': sum(1 for p in weak if p['degraded']),
+        'unparsedPosts': unparsed,
+        'failures': failures,
+    }, ensure_ascii=False, indent=2))
+    if blocking:
+        return 1
+    if unparsed and not args.allow_unparsed:
+        return 2
+    return 0
+
+
+def legacy_is_weak_analysis(analysis: dict) -> bool:
+    # Pre-compiled-validator implementation, kept only as the benchmark baseline.
+    def legacy_has_placeholder(text):
+        t = clean(text)
+        return any(re.search(p, t, re.IGNORECASE) for p in PLACEHOLDER_PATTERNS)
+
+    feature = analysis.get('feature', '')
+    if not feature or len(feature) < 40 or legacy_has_placeholder(feature):
+        return True
+    for key in ('stack', 'core', 'arch_components'):
+        if any(legacy_has_placeholder(x) for x in analysis.get(key, [])):
+            return True
+    return (
+        len(analysis.get('core', [])) < 3
+        or len(analysis.get('arch_components', [])) < 2
+        or len(analysis.get('collaborations', [])) < 1
+    )
+
+
+def run_validate_benchmark(args):
+    analyses = []
+    for path in list_trend_sidecars():
+        data = json.loads(path.read_text(encoding='utf-8'))
+        analyses.extend(item['analysis'] for item in data.get('items') or [] if item.get('analysis'))
+    if not analyses:
+        analyses = [{
+            'feature': '一个面向开发者的开源工具，帮助团队在本地与 CI 中自动化代码审查、依赖升级与发布流程，适用于中大型仓库的日常维护场景。',
+            'stack': ['TypeScript', 'Node.js', 'GitHub Actions'],
+            'core': ['自动审查拉取请求并给出修改建议', '批量升级依赖并生成变更说明', '按语义化版本自动发布', '汇总仓库健康度报告'],
+            'arch_components': ['CLI', '规则引擎', 'GitHub API 客户端'],
+            'collaborations': [{'from': 'CLI', 'to': '规则引擎', 'relation': '调用'}],
+        }]
+    corpus = [analyses[i % len(analyses)] for i in range(args.count)]
+
+    timings = {}
+    for name, check in (('legacy', legacy_is_weak_analysis), ('compiled', is_weak_analysis)):
+        re.purge()
+        start = time.perf_counter()
+        weak = sum(1 for a in corpus if check(a))
+        timings[name] = {'seconds': round(time.perf_counter() - start, 4), 'weak': weak}
+
+    legacy_s = timings['legacy']['seconds']
+    compiled_s = timings['compiled']['seconds']
+    timings['speedup'] = round(legacy_s / compiled_s, 2) if compiled_s else None
+    timings['analyses'] = len(corpus)
+    print(json.dumps(timings, ensure_ascii=False))
+
+
+def build_site():
+    subprocess.run(['npm', 'run', 'build:site'], cwd=str(ROOT), check=True)
+
+
+def run_daily():
     tz = timezone(timedelta(hours=8))
     now = datetime.now(tz)
     date_str = now.strftime('%Y-%m-%d')
@@ -744,17 +1434,87 @@ def main():
         raise RuntimeError('解析 Trending 失败，未拿到有效项目')
 
     ensure_category('github trend')
+    items = enrich_with_github_metadata(items)
     items = clone_and_analyze(items)
     slug, content = render_markdown(date_str, items)
 
     POSTS_DIR.mkdir(parents=True, exist_ok=True)
     post_file = POSTS_DIR / f'{slug}.md'
     post_file.write_text(content, encoding='utf-8')
+    write_trend_sidecar(date_str, slug, items, content_hash(content))
+    append_post_to_search_index(slug, items)
 
-    subprocess.run(['npm', 'run', 'build:site'], cwd=str(ROOT), check=True)
+    build_site()
 
     print(json.dumps({'slug': slug, 'url': f'https://opflow.cc/posts/{slug}/'}, ensure_ascii=False))
 
 
+def run_rerender(args):
+    sidecars = list_trend_sidecars(args.date_from, args.date_to)
+    results = {'changed': [], 'unchanged': [], 'skipped': [], 'edited': []}
+    worker = partial(rerender_from_sidecar, force=args.force)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for slug, outcome in pool.map(worker, [str(p) for p in sidecars]):
+            results[outcome].append(slug)
+
+    if results['changed'] and not args.no_build:
+        build_site()
+
+    print(json.dumps({
+        'total': len(sidecars),
+        'changed': len(results['changed']),
+        'unchanged': len(results['unchanged']),
+        'skipped': len(results['skipped']),
+        'edited': len(results['edited']),
+        'slugs': results['changed'],
+        'skippedSlugs': results['skipped'],
+        'editedSlugs': results['edited'],
+    }, ensure_ascii=False))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='GitHub Trending 日报生成')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('run', help='抓取并生成当日 Trend 文章（默认）')
+
+    rerender = sub.add_parser('rerender', help='基于 .trend.json 旁路文件批量重新渲染历史 Trend 文章')
+    rerender.add_argument('--from', dest='date_from', help='起始日期 YYYY-MM-DD（含）')
+    rerender.add_argument('--to', dest='date_to', help='结束日期 YYYY-MM-DD（含）')
+    rerender.add_argument('--workers', type=int, default=None, help='进程数，默认 CPU 核数')
+    rerender.add_argument('--no-build', action='store_true', help='只重写 Markdown，不触发站点构建')
+    rerender.add_argument('--force', action='store_true', help='覆盖在后台手动编辑过的文章')
+
+    search_index = sub.add_parser('search-index', help='维护站内搜索倒排索引（默认清理已删除文章的倒排项）')
+    search_index.add_argument('--rebuild', action='store_true', help='基于全部 .trend.json 旁路文件重建索引')
+    search_index.add_argument('--remove', metavar='SLUG', action='append', help='移除指定文章的倒排项，可重复')
+    search_index.add_argument('--no-build', action='store_true', help='不触发站点构建（客户端 manifest 由构建生成）')
+
+    lint = sub.add_parser('lint', help='并行校验存档的全部分析结果（无 .trend.json 时解析 Markdown）')
+    lint.add_argument('--from', dest='date_from', help='起始日期 YYYY-MM-DD（含）')
+    lint.add_argument('--to', dest='date_to', help='结束日期 YYYY-MM-DD（含）')
+    lint.add_argument('--workers', type=int, default=None, help='进程数，默认 CPU 核数')
+    lint.add_argument('--strict', action='store_true', help='同时按 ANALYSIS_JSON_SCHEMA 的长度/数量/模式约束校验')
+    lint.add_argument('--include-degraded', action='store_true', help='降级分析（clone 失败等）也计为失败')
+    lint.add_argument('--allow-unparsed', action='store_true', help='无法从 Markdown 解析出项目的历史文章不计为失败')
+
+    bench = sub.add_parser('bench-validate', help='对比旧版与编译版分析校验器的吞吐')
+    bench.add_argument('--count', type=int, default=100000, help='校验次数（样本取自存档，缺失时使用内置样例）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'rerender':
+        run_rerender(args)
+    elif args.command == 'search-index':
+        run_search_index(args)
+    elif args.command == 'lint':
+        raise SystemExit(run_lint(args))
+    elif args.command == 'bench-validate':
+        run_validate_benchmark(args)
+    else:
+        run_daily()
+
+
 if __name__ == '__main__':
     main()
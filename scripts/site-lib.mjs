@@ -5,6 +5,8 @@ import matter from 'gray-matter';
 export const ROOT_DIR = process.cwd();
 export const CONTENT_POSTS_DIR = path.join(ROOT_DIR, 'content', 'posts');
 export const PUBLIC_POSTS_DIR = path.join(ROOT_DIR, 'posts');
+const SEARCH_INDEX_DIR = path.join(ROOT_DIR, 'content', 'search');
+const SEARCH_STATE_PATH = path.join(ROOT_DIR, 'content', 'search-state.json');
 
 const CANONICAL_BASE = 'https://opflow.cc:58050';
 
@@ -167,6 +169,8 @@ export async function writePost(post) {
 export async function deletePostMarkdown(slug) {
   const target = markdownPathForSlug(slug);
   await fs.rm(target, { force: true });
+  // Trend sidecar written by scripts/github_trend_daily.py; without it `rerender` cannot resurrect the post.
+  await fs.rm(path.join(CONTENT_POSTS_DIR, `${slug}.trend.json`), { force: true });
 }
 
 function navLink(href, label, iconPath, active) {
@@ -295,12 +299,36 @@ async function getAssetVersion() {
   const stylePath = path.join(ROOT_DIR, 'assets', 'style.css');
   const mainPath = path.join(ROOT_DIR, 'assets', 'main.js');
   const postRendererPath = path.join(ROOT_DIR, 'assets', 'post-renderer.js');
-  const [styleStat, mainStat, postRendererStat] = await Promise.all([
+  const searchPath = path.join(ROOT_DIR, 'assets', 'search.js');
+  const [styleStat, mainStat, postRendererStat, searchStat] = await Promise.all([
     fs.stat(stylePath),
     fs.stat(mainPath),
     fs.stat(postRendererPath),
+    fs.stat(searchPath),
   ]);
-  return `${Math.trunc(styleStat.mtimeMs)}-${Math.trunc(mainStat.mtimeMs)}-${Math.trunc(postRendererStat.mtimeMs)}`;
+  return `${Math.trunc(styleStat.mtimeMs)}-${Math.trunc(mainStat.mtimeMs)}-${Math.trunc(postRendererStat.mtimeMs)}-${Math.trunc(searchStat.mtimeMs)}`;
+}
+
+// The client manifest only lists docs of published posts, so deleted/draft posts never show up in search.
+// Writer bookkeeping stays in content/search-state.json (maintained by scripts/github_trend_daily.py).
+async function writeSearchManifest(publishedPostSlugs) {
+  let state;
+  try {
+    state = JSON.parse(await fs.readFile(SEARCH_STATE_PATH, 'utf8'));
+  } catch (error) {
+    if (error.code === 'ENOENT') return;
+    throw error;
+  }
+
+  const docs = Object.fromEntries(
+    Object.entries(state.docs ?? {}).filter(([, doc]) => publishedPostSlugs.has(doc[0])),
+  );
+  await fs.mkdir(SEARCH_INDEX_DIR, { recursive: true });
+  await fs.writeFile(
+    path.join(SEARCH_INDEX_DIR, 'manifest.json'),
+    JSON.stringify({ version: state.version, shardCount: state.shardCount, docs }),
+    'utf8',
+  );
 }
 
 let currentAssetVersion = '';
@@ -390,7 +418,7 @@ export async function buildSite() {
     contentHtml: indexContent,
   }));
 
-  const listContent = `<h1>列表</h1><div class="post-list"><ul class="m-list">${renderPostList(publishedPosts)}</ul></div>`;
+  const listContent = `<h1>列表</h1><p class="more"><a href="/search/">搜索文章</a></p><div class="post-list"><ul class="m-list">${renderPostList(publishedPosts)}</ul></div>`;
   await writePage(path.join(ROOT_DIR, 'list', 'index.html'), renderPage({
     title: '列表',
     canonicalPath: '/list/',
@@ -399,6 +427,24 @@ export async function buildSite() {
     contentHtml: listContent,
   }));
 
+  const searchContent = `
+<h1>搜索</h1>
+<form id="search-form" role="search">
+  <input id="search-input" type="search" name="q" placeholder="仓库名、语言、技术栈或功能关键词" autocomplete="off">
+  <button type="submit">搜索</button>
+</form>
+<div class="post-list" id="search-results"></div>
+<noscript><p>请启用 JavaScript 以使用站内搜索。</p></noscript>
+`;
+  await writePage(path.join(ROOT_DIR, 'search', 'index.html'), renderPage({
+    title: '搜索',
+    canonicalPath: '/search/',
+    depth: 1,
+    active: null,
+    contentHtml: searchContent,
+    extraScripts: `<script src="../assets/search.js?v=${getAssetVersionForPage()}"></script>`,
+  }));
+
   const categoryGroups = buildCategoryMap(publishedPosts);
   const categoryLinks = categoryGroups
     .map(([category, bucket]) => `<a href="#${slugifyAnchor(category)}">${escapeHtml(category)} (${bucket.length})</a>`)
@@ -466,6 +512,7 @@ export async function buildSite() {
   }));
 
   await ensurePostAliases(publishedPosts);
+  await writeSearchManifest(publishedPostSlugs);
 
   return { postCount: publishedPosts.length };
 }